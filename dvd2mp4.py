@@ -7,7 +7,7 @@ ffmpeg/ffprobe.
 This module provides a small CLI (``main``) and helper functions to:
 
 - run shell commands safely with optional output capture and verbose logging
-- concatenate multiple VOB files into a temporary container
+- concatenate multiple VOB files via ffmpeg's concat demuxer
 - select an audio stream and transcode the video/audio into an MP4 file
 
 Requirements
@@ -27,14 +27,56 @@ Split by VTS prefix and create multiple MP4s:
 """
 
 import argparse
-import glob
+import fnmatch
+import functools
+import hashlib
+import json
 import os
-import re
 import shutil
 import subprocess
 import sys
 import tempfile
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+# ffmpegスレッド数/ジョブ (並列変換時のオーバーサブスクリプション回避)
+_THREADS_PER_JOB = 4
+
+# サブプロセスのパイプバッファサイズ。デフォルト(≈8KB)だと大きな
+# ffprobe出力で read() システムコールが増えるため1MBに拡大する。
+# (Windowsではパイプが4KBに制限されるが、指定しても無害)
+_PIPE_BUFSIZE = 1 << 20
+
+# H.264ハードウェアエンコーダ: --hw の選択肢 -> (エンコーダ名, 品質引数)
+# 検出は辞書順 (NVENC → QuickSync → VideoToolbox → AMF)
+_HW_ENCODERS = {
+    "nvenc": ("h264_nvenc", ["-preset", "p5", "-cq", "23"]),
+    "qsv": ("h264_qsv", ["-global_quality", "23"]),
+    "vt": ("h264_videotoolbox", ["-q:v", "60"]),
+    "amf": ("h264_amf", ["-quality", "quality"]),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_path(tool):
+    """Resolve and memoize the absolute path of an external tool.
+
+    Resolving once per process avoids re-walking ``$PATH`` (one stat
+    per candidate directory) on every spawn, and exec'ing an absolute
+    path skips kernel PATH resolution and PATH-spoofing surface.
+
+    Parameters
+    ----------
+    tool : str
+        Executable name, e.g. "ffmpeg".
+
+    Returns
+    -------
+    str or None
+        Absolute path of the executable, or None when not on PATH.
+    """
+    return shutil.which(tool)
 
 
 def run_command(cmd, verbose=False, capture_output=False):
@@ -70,6 +112,9 @@ def run_command(cmd, verbose=False, capture_output=False):
         Exits with code 1 if the subprocess returns a non-zero exit
         status.
     """
+    # text=True だと TextIOWrapper がチャンクごとにUTF-8デコードする。
+    # ffmpeg/ffprobe の出力はASCII安全なので、bytesで受けて最後に
+    # 1回だけデコードする。
     if verbose:
         print("▶", " ".join(cmd))
         if capture_output:
@@ -78,9 +123,9 @@ def run_command(cmd, verbose=False, capture_output=False):
                 check=True,
                 stdout=subprocess.PIPE,
                 stderr=sys.stderr,
-                text=True,
+                bufsize=_PIPE_BUFSIZE,
             )
-            return result.stdout
+            return result.stdout.decode("ascii", "replace")
         else:
             subprocess.run(cmd, check=True)
             return None
@@ -95,31 +140,369 @@ def run_command(cmd, verbose=False, capture_output=False):
                 stderr=subprocess.PIPE
                 if capture_output
                 else subprocess.DEVNULL,
-                text=True,
+                bufsize=_PIPE_BUFSIZE,
             )
-            return result.stdout if capture_output else None
+            if capture_output:
+                return result.stdout.decode("ascii", "replace")
+            return None
         except subprocess.CalledProcessError as e:
             print(f"❌ Command failed: {' '.join(cmd)}", file=sys.stderr)
             if e.stderr:
-                print(e.stderr, file=sys.stderr)
+                print(e.stderr.decode("ascii", "replace"), file=sys.stderr)
             sys.exit(1)
 
 
-def convert_vobs_to_mp4(vob_files, output_file, verbose=False, aspect=None):
-    """Concatenate VOB files and transcode them to an MP4 file.
+# fingerprint計算に読むMPEG-PSヘッダ領域のサイズ
+_PROBE_HEADER_BYTES = 2_000_000
+
 
-    The function concatenates the provided VOB files into a single
-    temporary file, probes available audio streams using ``ffprobe``,
-    and then runs ``ffmpeg`` to transcode the video to H.264 and audio
-    to AAC. The first audio stream found is used.
+def _fingerprint(vob_path):
+    """Hash the MPEG-PS header region of a VOB for probe cache keying.
+
+    Reads the first 2 MB (program stream headers) and hashes it with
+    blake2b, so VTS groups sharing the same stream layout map to the
+    same cache entry without reading whole multi-GB files.
+
+    Parameters
+    ----------
+    vob_path : str
+        VOB file to fingerprint.
+
+    Returns
+    -------
+    str
+        Hex digest of the header region.
+    """
+    with open(vob_path, "rb") as f:
+        header = f.read(_PROBE_HEADER_BYTES)
+    return hashlib.blake2b(header).hexdigest()
+
+
+# ffprobe結果キャッシュ: ヘッダfingerprint -> ProbeResult
+_PROBE_CACHE = {}
+
+
+def _probe_file(vob_path):
+    """Run the fused ffprobe call on one file (uncached).
+
+    Parameters
+    ----------
+    vob_path : str
+        VOB file passed to ffprobe.
+
+    Returns
+    -------
+    ProbeResult
+        See :func:`_probe`.
+    """
+    ffprobe_cmd = [
+        _tool_path("ffprobe") or "ffprobe",
+        "-v",
+        "error",
+        "-print_format",
+        "json",
+        "-show_entries",
+        "stream=index,codec_type,codec_name,display_aspect_ratio"
+        ":format=duration",
+        vob_path,
+    ]
+    output = run_command(ffprobe_cmd, capture_output=True)
+
+    result = ProbeResult(file_size=os.path.getsize(vob_path))
+    parsed = json.loads(output) if output else {}
+    duration = parsed.get("format", {}).get("duration")
+    if duration:
+        result.duration = float(duration)
+    streams = parsed.get("streams", [])
+    for stream in streams:
+        codec_type = stream.get("codec_type")
+        if codec_type == "audio" and result.audio_stream is None:
+            result.audio_stream = str(stream["index"])
+            result.audio_codec = stream.get("codec_name")
+        elif codec_type == "video" and result.video_codec is None:
+            result.video_codec = stream.get("codec_name")
+            result.dar = stream.get("display_aspect_ratio")
+
+    return result
+
+
+@dataclass
+class ProbeResult:
+    """Parsed ffprobe answers for a VOB.
+
+    Attributes
+    ----------
+    audio_stream : str or None
+        First audio stream index, usable in ffmpeg ``-map``.
+    dar : str or None
+        Display aspect ratio of the first video stream.
+    video_codec : str or None
+        ``codec_name`` of the first video stream.
+    audio_codec : str or None
+        ``codec_name`` of the first audio stream.
+    duration : float or None
+        Container duration in seconds of the probed file (not of the
+        whole VTS set).
+    file_size : int or None
+        Size in bytes of the probed file, for scaling ``duration`` to
+        a whole VOB set.
+    """
+
+    audio_stream: str = None
+    dar: str = None
+    video_codec: str = None
+    audio_codec: str = None
+    duration: float = None
+    file_size: int = None
+
+
+@dataclass
+class OutputSpec:
+    """One output of a single-input ffmpeg invocation.
+
+    Passing several specs to :func:`convert_vobs_to_mp4` produces all
+    outputs (e.g. multiple resolutions of the same VTS) from a single
+    decode pass instead of re-reading and re-decoding the VOBs per
+    output.
+
+    Attributes
+    ----------
+    path : str
+        Output MP4 path. Existing files are overwritten.
+    vcodec_args : list of str or None
+        Per-output video codec arguments; None uses the caller's
+        default (libx264 or the selected hardware encoder).
+    scale : str or None
+        Optional ffmpeg scale filter argument (e.g. ``"640:-2"``).
+    """
+
+    path: str
+    vcodec_args: list = None
+    scale: str = None
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_hw_encoder():
+    """Detect the first available hardware H.264 encoder.
+
+    Runs ``ffmpeg -encoders`` once and scans for the encoders listed
+    in :data:`_HW_ENCODERS`, in that order. Presence in the ffmpeg
+    build does not guarantee working hardware, which is why this is
+    only consulted for ``--hw auto``.
+
+    Returns
+    -------
+    str or None
+        A key of :data:`_HW_ENCODERS`, or None when no hardware
+        encoder is available.
+    """
+    output = run_command(
+        [_tool_path("ffmpeg") or "ffmpeg", "-hide_banner", "-encoders"],
+        capture_output=True,
+    )
+    for key, (encoder, _) in _HW_ENCODERS.items():
+        if encoder in (output or ""):
+            return key
+    return None
+
+
+def _probe(vob_path, verbose=False):
+    """Probe the audio stream index and aspect ratio in one ffprobe call.
+
+    A single JSON-mode invocation answers both questions, instead of
+    paying the ffprobe process spawn cost twice. Results live in a
+    module-level dict keyed by a fingerprint of the VOB's header
+    region alone, so VTS groups sharing the same stream layout (the
+    common case on a single DVD) probe only once regardless of path.
+
+    Parameters
+    ----------
+    vob_path : str
+        VOB file to inspect. The first VOB of a set is sufficient
+        because stream layout is identical across a VTS set.
+    verbose : bool, optional
+        If True, print a progress message. Default is False.
+
+    Returns
+    -------
+    ProbeResult
+        Audio stream index, display aspect ratio and codec names of
+        the first video/audio streams. Fields are None when absent.
+    """
+    fingerprint = _fingerprint(vob_path)
+    if fingerprint not in _PROBE_CACHE:
+        if verbose:
+            print(
+                f"🔍 Probing {vob_path} (fingerprint {fingerprint[:12]}…)"
+            )
+        _PROBE_CACHE[fingerprint] = _probe_file(vob_path)
+    return _PROBE_CACHE[fingerprint]
+
+
+def _run_ffmpeg_with_progress(ffmpeg_cmd, duration=None, verbose=False):
+    """Run ffmpeg while rendering a single-line progress display.
+
+    Appends ``-progress pipe:1 -nostats`` so ffmpeg emits
+    machine-readable ``key=value`` progress blocks on stdout, and
+    rewrites one stderr line with percentage and encode speed — no
+    libav chatter, and SSH-friendly output volume.
+
+    Parameters
+    ----------
+    ffmpeg_cmd : list of str
+        Full ffmpeg command line including output path(s).
+    duration : float or None, optional
+        Source duration in seconds, used for the percentage. When
+        None only the encoded time and speed are shown.
+    verbose : bool, optional
+        If True, print the command and keep ffmpeg's own stderr
+        visible. Default is False.
+
+    Raises
+    ------
+    SystemExit
+        Exits with code 1 if ffmpeg returns a non-zero exit status.
+    """
+    cmd = list(ffmpeg_cmd) + ["-progress", "pipe:1", "-nostats"]
+    if verbose:
+        print("▶", " ".join(cmd))
+    # 非verbose時もstderrは捨てずにスプールし、失敗時に表示する
+    stderr_spool = None if verbose else tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=stderr_spool,
+        bufsize=_PIPE_BUFSIZE,
+    )
+    out_time_us = 0
+    speed = ""
+    for raw in proc.stdout:
+        key, _, value = (
+            raw.decode("ascii", "replace").strip().partition("=")
+        )
+        if key in ("out_time_us", "out_time_ms"):
+            # out_time_ms も歴史的事情でマイクロ秒単位
+            try:
+                out_time_us = int(value)
+            except ValueError:
+                pass
+        elif key == "speed":
+            speed = value.strip()
+        elif key == "progress":
+            # 1インターバル分のブロックの終端ごとに描画
+            seconds = out_time_us / 1_000_000
+            if duration:
+                pct = min(100.0, seconds / duration * 100)
+                line = f"⏳ {pct:5.1f}% ({seconds:.0f}s/{duration:.0f}s)"
+            else:
+                line = f"⏳ {seconds:.0f}s encoded"
+            if speed:
+                line += f" {speed}"
+            print(f"\r{line}", end="", file=sys.stderr, flush=True)
+    proc.stdout.close()
+    returncode = proc.wait()
+    print(file=sys.stderr)
+    if returncode != 0:
+        print(f"❌ Command failed: {' '.join(cmd)}", file=sys.stderr)
+        if stderr_spool is not None:
+            stderr_spool.seek(0)
+            err = stderr_spool.read().decode("ascii", "replace")
+            if err:
+                print(err, file=sys.stderr)
+        sys.exit(1)
+    if stderr_spool is not None:
+        stderr_spool.close()
+
+
+def _prefetch_vobs(vob_files):
+    """Hint kernel readahead for the first VOB ffmpeg will read.
+
+    ``POSIX_FADV_WILLNEED`` starts paging in the first file while
+    ffmpeg initializes, hiding some spin-up/seek latency on slow
+    optical/spinning media. (``POSIX_FADV_SEQUENTIAL`` would be
+    pointless here: it only tunes the readahead window of this open
+    file description, which ffmpeg's own opens do not inherit.)
+    No-op on platforms without ``os.posix_fadvise``.
+
+    Parameters
+    ----------
+    vob_files : list of str
+        VOB files in read order; only the first is advised.
+    """
+    if not hasattr(os, "posix_fadvise") or not vob_files:
+        return
+    fd = os.open(vob_files[0], os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+
+@dataclass
+class CommandPlan:
+    """Fully resolved description of one conversion, ready to execute.
+
+    Built by :func:`plan_conversion` (argv construction, no side
+    effects beyond an optional memoized probe) and carried out by
+    :func:`execute_plan` (temp file + subprocess I/O). Picklable, so
+    split mode builds every plan once in the parent and ships them to
+    pool workers.
+
+    Attributes
+    ----------
+    vob_files : list of str
+        Ordered VOB paths, written to the concat list at execute time.
+    ffmpeg_args : list of str
+        Arguments following the input: maps, codecs and output
+        paths. The executable and ``-f concat ... -i <list>`` head is
+        prepended at execute time, because the list file only exists
+        then.
+    output_paths : list of str
+        Output MP4 paths, for logging.
+    duration : float or None
+        Estimated total duration in seconds for the progress display.
+    verbose : bool
+        Echo commands and progress messages while executing.
+    show_progress : bool
+        Render the single-line encode progress display.
+    """
+
+    vob_files: list
+    ffmpeg_args: list
+    output_paths: list
+    duration: float = None
+    verbose: bool = False
+    show_progress: bool = True
+
+
+def plan_conversion(
+    vob_files,
+    output_file,
+    verbose=False,
+    aspect=None,
+    threads=None,
+    probe=None,
+    vcodec_args=None,
+    preset="veryfast",
+    crf=20,
+    audio_bitrate="192k",
+    show_progress=True,
+):
+    """Build the :class:`CommandPlan` for one VOB set.
+
+    Decides stream mapping, codecs (including the remux fast path)
+    and aspect handling, and lays out the full ffmpeg argv tail.
+    Given a ``probe`` result this is pure argv construction; without
+    one the (memoized) ffprobe helper is consulted.
 
     Parameters
     ----------
     vob_files : list of str
         Ordered list of VOB file paths to concatenate and transcode.
-    output_file : str
-        Path to write the resulting MP4 file. If a file exists it will
-        be overwritten.
+    output_file : str or list of OutputSpec
+        Path to write the resulting MP4 file, or a list of
+        :class:`OutputSpec` to produce several outputs from one decode
+        pass. Existing files are overwritten.
     verbose : bool, optional
         If True, print progress messages and ffmpeg/ffprobe commands.
         Default is False.
@@ -127,105 +510,210 @@ def convert_vobs_to_mp4(vob_files, output_file, verbose=False, aspect=None):
         Manually specify an output aspect ratio (e.g. "16:9" or "4:3").
         When None the function will attempt to autodetect the aspect
         ratio using ffprobe.
+    threads : int or None, optional
+        Limit the number of ffmpeg threads (``-threads``). Used to
+        avoid oversubscription when several conversions run in
+        parallel. When None, ffmpeg decides.
+    probe : ProbeResult or None, optional
+        Probe answers to use instead of running ffprobe here. Passing
+        it in lets split mode probe a disc once and share the answers
+        across groups.
+    vcodec_args : list of str or None, optional
+        Video codec arguments (e.g. ``["-c:v", "h264_nvenc", ...]``)
+        to use in place of the default software libx264 encode.
+    preset : str, optional
+        libx264 preset for the default software encode. Default is
+        "veryfast", which is visually equivalent to slower presets on
+        already-lossy SD DVD sources at a fraction of the time.
+    crf : int, optional
+        libx264 constant rate factor. Default is 20.
+    audio_bitrate : str, optional
+        AAC bitrate for transcoded audio (ignored when the source
+        audio is stream-copied). Default is "192k".
+    show_progress : bool, optional
+        If True, render a single-line encode progress display on
+        stderr. Disabled when several conversions run in parallel so
+        their lines do not interleave. Default is True.
+
+    Returns
+    -------
+    CommandPlan or None
+        The plan, or None when the source has no audio stream (an
+        error is printed).
 
     Notes
     -----
-    - Requires ``ffmpeg`` and ``ffprobe`` to be available in PATH.
-    - Uses a temporary directory to store the concatenated VOB prior
-      to transcoding; temporary files are removed automatically.
-
-    Examples
-    --------
-    >>> convert_vobs_to_mp4(["VTS_01_1.VOB", "VTS_01_2.VOB"], "out.mp4")
+    - Probing is done on the first VOB only: stream layout is
+      identical across the VOBs of a VTS set.
+    - When a source stream is already MP4-compatible (H.264 video,
+      AAC/MP3 audio) it is remuxed with ``-c copy`` instead of being
+      re-encoded.
     """
-    with tempfile.TemporaryDirectory() as tmpdir:
-        concat_vob = os.path.join(tmpdir, "concat.VOB")
-        # VOB結合
-        with open(concat_vob, "wb") as outfile:
-            for vf in vob_files:
-                if verbose:
-                    print(f"  ➕ {vf}")
-                with open(vf, "rb") as infile:
-                    shutil.copyfileobj(infile, outfile)
-
-        # 音声ストリーム取得
-        ffprobe_audio = [
-            "ffprobe",
-            "-v",
-            "error",
-            "-select_streams",
-            "a",
-            "-show_entries",
-            "stream=index",
-            "-of",
-            "default=noprint_wrappers=1:nokey=1",
-            concat_vob,
-        ]
-        audio_streams = run_command(
-            ffprobe_audio, verbose=verbose, capture_output=True
+    if isinstance(output_file, (str, os.PathLike)):
+        outputs = [OutputSpec(os.fspath(output_file))]
+    else:
+        outputs = list(output_file)
+
+    # probe結果: 呼び出し元から渡されなければ1回のffprobeで取得
+    # (split時は親プロセスが取得して共有する)
+    if probe is None:
+        probe = _probe(vob_files[0], verbose=verbose)
+    audio_stream = probe.audio_stream
+    if audio_stream is None:
+        print(
+            f"❌ No audio streams found in {vob_files[0]}",
+            file=sys.stderr,
         )
-        if not audio_streams:
+        return None
+    if verbose:
+        print(f"🔊 Using audio stream: {audio_stream}")
+
+    # アスペクト比: ユーザー指定があればそれを使い、なければ検出値
+    if aspect:
+        dar = aspect
+        if verbose:
+            print(f"📐 Using user-specified aspect ratio: {dar}")
+    else:
+        dar = probe.dar
+        if verbose and dar:
+            print(f"📐 Detected aspect ratio: {dar}")
+
+    # ソースが既にMP4互換コーデックならremuxで済ませる
+    remux_video = probe.video_codec == "h264" and vcodec_args is None
+    if remux_video and verbose:
+        print("🚀 Source video is already H.264 — remuxing without re-encode")
+    if probe.audio_codec in ("aac", "mp3"):
+        acodec_args = ["-c:a", "copy"]
+        if verbose:
             print(
-                f"❌ No audio streams found in {concat_vob}", file=sys.stderr
+                f"🚀 Source audio is already {probe.audio_codec} — copying"
             )
-            return
-        audio_stream = audio_streams.strip().splitlines()[0]
-        if verbose:
-            print(f"🔊 Using audio stream: {audio_stream}")
-
-        # アスペクト比: ユーザー指定があればそれを使い、なければ ffprobe で自動検出
-        dar = None
-        if aspect:
-            dar = aspect
-            if verbose:
-                print(f"📐 Using user-specified aspect ratio: {dar}")
+    else:
+        acodec_args = ["-c:a", "aac", "-b:a", audio_bitrate]
+
+    # 出力ごとに -map/コーデック/出力パスを連ねる (デコードは1回)
+    ffmpeg_args = []
+    for spec in outputs:
+        ffmpeg_args += ["-map", "0:v:0", "-map", f"0:{audio_stream}"]
+        if spec.scale:
+            ffmpeg_args += ["-vf", f"scale={spec.scale}"]
+        if spec.vcodec_args:
+            ffmpeg_args += spec.vcodec_args
+        elif remux_video and not spec.scale:
+            ffmpeg_args += ["-c:v", "copy"]
+        elif vcodec_args:
+            ffmpeg_args += vcodec_args
         else:
-            ffprobe_video = [
-                "ffprobe",
-                "-v",
-                "error",
-                "-select_streams",
-                "v:0",
-                "-show_entries",
-                "stream=display_aspect_ratio",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                concat_vob,
+            # sliced-threads はスライス並列を有効にし多コアで効く
+            ffmpeg_args += [
+                "-c:v",
+                "libx264",
+                "-preset",
+                preset,
+                "-crf",
+                str(crf),
+                "-x264-params",
+                "sliced-threads=1",
             ]
-            dar = run_command(
-                ffprobe_video, verbose=verbose, capture_output=True
-            )
-            dar = dar.strip() if dar else None
-            if verbose and dar:
-                print(f"📐 Detected aspect ratio: {dar}")
+        ffmpeg_args += acodec_args
+        ffmpeg_args += ["-movflags", "+faststart"]
+        if dar:
+            ffmpeg_args += ["-aspect", dar]
+        if threads:
+            ffmpeg_args += ["-threads", str(threads)]
+        ffmpeg_args.append(spec.path)
+
+    # durationはprobeしたファイル1本のもの (split時はこのグループの
+    # VOBとは限らない)。DVDのPSはほぼCBRなので、probeしたファイルの
+    # サイズとの比で全体の長さを見積もる
+    duration = None
+    if probe.duration and probe.file_size:
+        total_size = sum(os.path.getsize(vf) for vf in vob_files)
+        duration = probe.duration * total_size / probe.file_size
+
+    return CommandPlan(
+        vob_files=list(vob_files),
+        ffmpeg_args=ffmpeg_args,
+        output_paths=[spec.path for spec in outputs],
+        duration=duration,
+        verbose=verbose,
+        show_progress=show_progress,
+    )
+
+
+def execute_plan(plan):
+    """Carry out a :class:`CommandPlan`.
+
+    Writes the concat list file, hints kernel readahead and runs the
+    ffmpeg invocation described by the plan.
+
+    Parameters
+    ----------
+    plan : CommandPlan
+        Plan from :func:`plan_conversion`.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        concat_list = os.path.join(tmpdir, "concat.txt")
+        # concat demuxer 用のリストファイル作成
+        # (シングルクォートは demuxer の規則 '\'' でエスケープ)
+        with open(concat_list, "w") as listfile:
+            for vf in plan.vob_files:
+                if plan.verbose:
+                    print(f"  ➕ {vf}")
+                escaped = os.path.abspath(vf).replace("'", "'\\''")
+                listfile.write(f"file '{escaped}'\n")
+
+        # ffmpeg起動中に先読みが走るようにカーネルへヒントを出す
+        _prefetch_vobs(plan.vob_files)
 
         # ffmpeg変換
         ffmpeg_cmd = [
-            "ffmpeg",
+            _tool_path("ffmpeg") or "ffmpeg",
             "-y",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
             "-i",
-            concat_vob,
-            "-map",
-            "0:v:0",
-            "-map",
-            f"0:{audio_stream}",
-            "-c:v",
-            "libx264",
-            "-c:a",
-            "aac",
-            "-b:a",
-            "192k",
-            "-movflags",
-            "+faststart",
-        ]
-        if dar:
-            ffmpeg_cmd += ["-aspect", dar]
+            concat_list,
+        ] + plan.ffmpeg_args
 
-        ffmpeg_cmd.append(output_file)
-        run_command(ffmpeg_cmd, verbose=verbose)
+        if plan.show_progress:
+            _run_ffmpeg_with_progress(
+                ffmpeg_cmd, duration=plan.duration, verbose=plan.verbose
+            )
+        else:
+            run_command(ffmpeg_cmd, verbose=plan.verbose)
 
-        if verbose:
-            print(f"✅ Created {output_file}")
+        if plan.verbose:
+            for path in plan.output_paths:
+                print(f"✅ Created {path}")
+
+
+def convert_vobs_to_mp4(vob_files, output_file, **kwargs):
+    """Concatenate VOB files and transcode them to an MP4 file.
+
+    Convenience wrapper that builds the :class:`CommandPlan` with
+    :func:`plan_conversion` and immediately runs it with
+    :func:`execute_plan`. All keyword arguments are forwarded to
+    :func:`plan_conversion`.
+
+    Parameters
+    ----------
+    vob_files : list of str
+        Ordered list of VOB file paths to concatenate and transcode.
+    output_file : str or list of OutputSpec
+        Path to write the resulting MP4 file, or a list of
+        :class:`OutputSpec` to produce several outputs from one decode
+        pass. Existing files are overwritten.
+
+    Examples
+    --------
+    >>> convert_vobs_to_mp4(["VTS_01_1.VOB", "VTS_01_2.VOB"], "out.mp4")
+    """
+    plan = plan_conversion(vob_files, output_file, **kwargs)
+    if plan is not None:
+        execute_plan(plan)
 
 
 def main():
@@ -241,6 +729,12 @@ def main():
     - ``-i/--input`` : path to the DVD folder containing VTS_*.VOB files
     - ``-o/--output`` : output filename for single-file mode
     - ``-s/--split`` : split into separate MP4 files per VTS prefix
+    - ``-j/--jobs`` : number of VTS groups to convert in parallel
+    - ``-a/--aspect`` : manually specify the output aspect ratio
+    - ``--preset`` : libx264 preset (default: veryfast)
+    - ``--crf`` : libx264 constant rate factor (default: 20)
+    - ``--audio-bitrate`` : AAC bitrate for transcoded audio
+    - ``--hw`` : hardware encoder selection (default: none, software)
     - ``-v/--verbose`` : enable verbose logging
 
     Returns
@@ -267,6 +761,56 @@ def main():
         action="store_true",
         help="Split by VTS prefix (generate multiple MP4 files)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help=(
+            "Number of VTS groups to convert in parallel in split mode "
+            "(default: min(number of groups, CPU cores // 4))"
+        ),
+    )
+    parser.add_argument(
+        "--preset",
+        choices=[
+            "ultrafast",
+            "superfast",
+            "veryfast",
+            "faster",
+            "fast",
+            "medium",
+            "slow",
+            "slower",
+            "veryslow",
+        ],
+        default="veryfast",
+        help=(
+            "libx264 preset. DVD sources are already lossy SD MPEG-2, "
+            "so 'veryfast' is visually equivalent to slower presets at "
+            "3-5x the encode speed (default: veryfast)"
+        ),
+    )
+    parser.add_argument(
+        "--crf",
+        type=int,
+        default=20,
+        help="libx264 constant rate factor (default: 20)",
+    )
+    parser.add_argument(
+        "--audio-bitrate",
+        default="192k",
+        help="AAC bitrate for transcoded audio (default: 192k)",
+    )
+    parser.add_argument(
+        "--hw",
+        choices=["auto", "none"] + list(_HW_ENCODERS),
+        default="none",
+        help=(
+            "Use a hardware H.264 encoder instead of libx264. "
+            "'auto' picks the first one found in the ffmpeg build "
+            "(default: none)"
+        ),
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enable verbose logging"
     )
@@ -280,9 +824,10 @@ def main():
     )
     args = parser.parse_args()
 
-    # ffmpeg / ffprobe check
+    # ffmpeg / ffprobe check (解決したパスはlru_cacheに載り、以降の
+    # コマンド組み立てはPATH再走査なしで絶対パスを使う)
     for tool in ("ffmpeg", "ffprobe"):
-        if shutil.which(tool) is None:
+        if _tool_path(tool) is None:
             print(
                 f"Error: {tool} not found in PATH. Please install it.",
                 file=sys.stderr,
@@ -296,7 +841,17 @@ def main():
         )
         sys.exit(1)
 
-    vob_files = sorted(glob.glob(os.path.join(input_dir, "VTS_??_*.VOB")))
+    # 1回のscandirでパスとサイズをまとめて取得 (statは1ファイル1回で、
+    # DirEntryが結果を保持するので後段のサイズ集計で再statしない)
+    vob_files = []
+    vob_sizes = {}
+    with os.scandir(input_dir) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.is_file() and fnmatch.fnmatch(
+                entry.name, "VTS_??_*.VOB"
+            ):
+                vob_files.append(entry.path)
+                vob_sizes[entry.path] = entry.stat().st_size
     if not vob_files:
         print(
             f"Error: no VTS_??_*.VOB files found in {input_dir}",
@@ -304,22 +859,69 @@ def main():
         )
         sys.exit(1)
 
+    # ハードウェアエンコーダ選択 (autoはffmpegビルドから検出)
+    hw = args.hw
+    if hw == "auto":
+        hw = _detect_hw_encoder()
+        if args.verbose and hw:
+            print(f"⚡ Hardware encoder detected: {_HW_ENCODERS[hw][0]}")
+    vcodec_args = None
+    if hw and hw != "none":
+        encoder, quality_args = _HW_ENCODERS[hw]
+        vcodec_args = ["-c:v", encoder] + quality_args
+
     if args.split:
         # プレフィックスごとにグループ化
+        # (globで VTS_??_*.VOB に絞った後なので先頭6文字が "VTS_NN")
         groups = defaultdict(list)
         for vf in vob_files:
-            m = re.search(r"(VTS_\d{2})_\d+\.VOB$", vf)
-            if m:
-                groups[m.group(1)].append(vf)
+            base = os.path.basename(vf)
+            if base.startswith("VTS_") and base[6:7] == "_":
+                groups[base[:6]].append(vf)
+
+        jobs = args.jobs
+        if not jobs:
+            jobs = min(
+                len(groups),
+                max(1, (os.cpu_count() or 1) // _THREADS_PER_JOB),
+            )
+
+        # VTSグループ間で音声構成/アスペクト比は共通なことがほとんど
+        # なので、親プロセスで1回だけprobeして各ワーカーに渡す
+        probe = _probe(vob_files[0], verbose=args.verbose)
 
+        # 親プロセスで全グループのプランを組み立ててからプールへ渡す
+        sized_plans = []
         for prefix, files in sorted(groups.items()):
             files.sort()
             output_file = f"{prefix}.mp4"
             if args.verbose:
                 print(f"📼 Processing group: {prefix} → {output_file}")
-            convert_vobs_to_mp4(
-                files, output_file, verbose=args.verbose, aspect=args.aspect
+            plan = plan_conversion(
+                files,
+                output_file,
+                verbose=args.verbose,
+                aspect=args.aspect,
+                threads=_THREADS_PER_JOB,
+                probe=probe,
+                vcodec_args=vcodec_args,
+                preset=args.preset,
+                crf=args.crf,
+                audio_bitrate=args.audio_bitrate,
+                show_progress=jobs == 1,
             )
+            if plan is not None:
+                group_size = sum(vob_sizes[f] for f in files)
+                sized_plans.append((group_size, plan))
+
+        # 大きいグループから投入してプール終盤の遊びを減らす
+        # (longest-job-first)
+        sized_plans.sort(key=lambda pair: pair[0], reverse=True)
+        plans = [pair[1] for pair in sized_plans]
+
+        # VTSグループは独立なので並列変換
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(execute_plan, plans))
 
     else:
         # すべて結合して1つのmp4
@@ -334,7 +936,14 @@ def main():
             print(f"💾 Output: {output_file}")
 
         convert_vobs_to_mp4(
-            vob_files, output_file, verbose=args.verbose, aspect=args.aspect
+            vob_files,
+            output_file,
+            verbose=args.verbose,
+            aspect=args.aspect,
+            vcodec_args=vcodec_args,
+            preset=args.preset,
+            crf=args.crf,
+            audio_bitrate=args.audio_bitrate,
         )
 
 